@@ -1,11 +1,18 @@
+import atexit
 import logging
 import os
+import queue
+import random
 import time
 from http import HTTPStatus
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from operator import itemgetter
+from types import MappingProxyType
 
 import requests
 from dotenv import load_dotenv
-from telebot import TeleBot, types
+from telebot import TeleBot
+from telebot.apihelper import ApiException
 
 # Константы сообщений
 MISSING_TOKENS_MSG = 'Отсутствуют переменные окружения: {}'
@@ -18,6 +25,7 @@ HOMEWORK_STRUCTURE_ERROR = "Некорректная структура дома
 HOMEWORK_NAME_ERROR = 'Отсутствует название домашней работы'
 UNKNOWN_STATUS_ERROR = 'Неизвестный статус домашней работы: {}'
 PROGRAM_ERROR_MSG = 'Сбой в работе программы: {}'
+HOMEWORK_SKIPPED_ERROR = 'Не удалось разобрать статус домашней работы: {}'
 
 load_dotenv()
 
@@ -28,15 +36,37 @@ TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 
 # Константы настроек:
 RETRY_PERIOD = 600
+# Потолок паузы при серии ошибок до применения разброса BACKOFF_JITTER;
+# итоговая пауза может превышать его не более чем в 1 + BACKOFF_JITTER раз:
+MAX_RETRY_PERIOD = 3600
+BACKOFF_FACTOR = 1.3
+BACKOFF_JITTER = 0.2
 ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
 HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
+# Таймауты запроса к API (соединение, чтение), секунды:
+REQUEST_TIMEOUT = (5, 30)
+# Таймаут запроса к Telegram, секунды:
+TELEGRAM_TIMEOUT = 10
+# Ограничение Telegram на длину одного сообщения:
+MESSAGE_MAX_LENGTH = 4096
+MESSAGE_SEPARATOR = '\n\n'
+
+# Извлечение полей из ответа API:
+GET_HOMEWORKS_AND_DATE = itemgetter('homeworks', 'current_date')
+# Поля, хотя бы одно из которых содержит название домашки:
+HOMEWORK_NAME_KEYS = ('homework_name', 'lesson_name')
 
 # Словарь статусов домашки:
-HOMEWORK_VERDICTS = {
+HOMEWORK_VERDICTS = MappingProxyType({
     'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
     'reviewing': 'Работа взята на проверку ревьюером.',
     'rejected': 'Работа проверена: у ревьюера есть замечания.'
-}
+})
+# Готовые шаблоны сообщений для каждого статуса:
+VERDICT_TEMPLATES = MappingProxyType({
+    status: f'Изменился статус проверки работы "{{name}}". {verdict}'
+    for status, verdict in HOMEWORK_VERDICTS.items()
+})
 
 ERROR_MESSAGE_TEMPLATE = (
     "Ошибка при запросе к API. URL: {url}, "
@@ -44,20 +74,49 @@ ERROR_MESSAGE_TEMPLATE = (
 )
 
 # Настройки логирования:
+LOG_MAX_BYTES = 10_000_000
+LOG_BACKUP_COUNT = 3
 logger = logging.getLogger(__name__)
 
 
+def configure_logging():
+    """Настраивает запись логов в консоль и файл из фонового потока."""
+    root_logger = logging.getLogger()
+    if any(
+        isinstance(handler, QueueHandler) for handler in root_logger.handlers
+    ):
+        return
+    log_queue = queue.Queue(-1)
+    log_listener = QueueListener(
+        log_queue,
+        logging.StreamHandler(),
+        RotatingFileHandler(
+            'bot.log',
+            maxBytes=LOG_MAX_BYTES,
+            backupCount=LOG_BACKUP_COUNT,
+            encoding='utf-8',
+            delay=True
+        ),
+        respect_handler_level=True
+    )
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[QueueHandler(log_queue)],
+        force=True
+    )
+    log_listener.start()
+    atexit.register(log_listener.stop)
+
+
 def check_tokens():
     """Проверка доступности токенов."""
-    tokens = {
-        'PRACTICUM_TOKEN': PRACTICUM_TOKEN,
-        'TELEGRAM_TOKEN': TELEGRAM_TOKEN,
-        'TELEGRAM_CHAT_ID': TELEGRAM_CHAT_ID
-    }
-    missing_tokens = [
-        name for name, value in tokens.items()
-        if not value
-    ]
+    tokens = (
+        ('PRACTICUM_TOKEN', PRACTICUM_TOKEN),
+        ('TELEGRAM_TOKEN', TELEGRAM_TOKEN),
+        ('TELEGRAM_CHAT_ID', TELEGRAM_CHAT_ID)
+    )
+    missing_tokens = [name for name, value in tokens if not value]
     if missing_tokens:
         error_message = MISSING_TOKENS_MSG.format(", ".join(missing_tokens))
         raise ValueError(error_message)
@@ -66,9 +125,11 @@ def check_tokens():
 def send_message(bot, message):
     """Функция отправки сообщений."""
     try:
-        bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=message)
+        bot.send_message(
+            chat_id=TELEGRAM_CHAT_ID, text=message, timeout=TELEGRAM_TIMEOUT
+        )
         logger.debug('Сообщение отправлено: %s', message)
-    except (types.TelegramError, ConnectionError) as error:
+    except (ApiException, requests.RequestException) as error:
         raise ConnectionError(SEND_MESSAGE_ERROR.format(error))
 
 
@@ -79,7 +140,8 @@ def get_api_answer(timestamp):
         response = requests.get(
             ENDPOINT,
             headers=HEADERS,
-            params=params
+            params=params,
+            timeout=REQUEST_TIMEOUT
         )
     except requests.RequestException as error:
         raise ConnectionError(ERROR_MESSAGE_TEMPLATE.format(
@@ -108,10 +170,11 @@ def check_response(response):
         raise TypeError(HOMEWORKS_FIELD_ERROR)
     if 'current_date' not in response:
         raise KeyError(CURRENT_DATE_FIELD_ERROR)
-    if response['homeworks']:
-        homework = response['homeworks'][0]
-        if 'status' not in homework or (
-            'homework_name' not in homework and 'lesson_name' not in homework
+    for homework in response['homeworks']:
+        if not isinstance(homework, dict):
+            raise TypeError(HOMEWORK_STRUCTURE_ERROR)
+        if 'status' not in homework or homework.keys().isdisjoint(
+            HOMEWORK_NAME_KEYS
         ):
             raise KeyError(HOMEWORK_STRUCTURE_ERROR)
 
@@ -123,11 +186,71 @@ def parse_status(homework):
     )
     if not homework_name:
         raise ValueError(HOMEWORK_NAME_ERROR)
-    status = homework.get('status')
-    if status not in HOMEWORK_VERDICTS:
+    try:
+        status = homework['status']
+    except KeyError:
+        raise KeyError(HOMEWORK_STRUCTURE_ERROR)
+    template = VERDICT_TEMPLATES.get(status)
+    if template is None:
         raise ValueError(UNKNOWN_STATUS_ERROR.format(status))
-    verdict = HOMEWORK_VERDICTS[status]
-    return f'Изменился статус проверки работы "{homework_name}". {verdict}'
+    return template.format(name=homework_name)
+
+
+def join_messages(messages):
+    """Склеивает сообщения в блоки не длиннее лимита Telegram.
+
+    Сообщение длиннее лимита разбивается на части.
+    """
+    parts = (
+        message[start:start + MESSAGE_MAX_LENGTH]
+        for message in messages
+        for start in range(0, len(message), MESSAGE_MAX_LENGTH)
+    )
+    chunks = []
+    chunk = ''
+    for message in parts:
+        candidate = (
+            f'{chunk}{MESSAGE_SEPARATOR}{message}' if chunk else message
+        )
+        if chunk and len(candidate) > MESSAGE_MAX_LENGTH:
+            chunks.append(chunk)
+            candidate = message
+        chunk = candidate
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def parse_statuses(homeworks):
+    """Возвращает сообщения со статусами, сообщая о некорректных домашках."""
+    messages = []
+    for homework in homeworks:
+        try:
+            messages.append(parse_status(homework))
+        except (KeyError, ValueError) as error:
+            message = HOMEWORK_SKIPPED_ERROR.format(error)
+            logger.error(message)
+            messages.append(message)
+    if not messages:
+        logger.debug('Нет новых статусов домашних работ')
+    return messages
+
+
+def send_messages(bot, messages):
+    """Отправляет сообщения по порядку, удаляя из списка доставленные."""
+    while messages:
+        send_message(bot, messages[0])
+        del messages[0]
+
+
+def get_retry_period(error_streak):
+    """Возвращает паузу перед следующим запросом с учётом серии ошибок."""
+    if error_streak <= 1:
+        return RETRY_PERIOD
+    period = min(
+        MAX_RETRY_PERIOD, RETRY_PERIOD * BACKOFF_FACTOR ** (error_streak - 1)
+    )
+    return period * random.uniform(1 - BACKOFF_JITTER, 1 + BACKOFF_JITTER)
 
 
 def main():
@@ -140,38 +263,32 @@ def main():
 
     bot = TeleBot(token=TELEGRAM_TOKEN)
     timestamp = int(time.time())
-    last_error = None
+    last_error_hash = None
+    error_streak = 0
+    pending_messages = []
     while True:
         try:
             response = get_api_answer(timestamp)
             check_response(response)
-            if response['homeworks']:
-                message = parse_status(response['homeworks'][0])
-                send_message(bot, message)
-                logger.debug('Отправлено сообщение: %s', message)
-            else:
-                logger.debug('Нет новых статусов домашних работ')
-            timestamp = response.get('current_date', timestamp)
+            homeworks, timestamp = GET_HOMEWORKS_AND_DATE(response)
+            pending_messages.extend(join_messages(parse_statuses(homeworks)))
+            send_messages(bot, pending_messages)
+            error_streak = 0
         except Exception as error:
             message = PROGRAM_ERROR_MSG.format(error)
-            if str(error) != last_error:
+            error_hash = hash(message)
+            if error_hash != last_error_hash:
                 try:
                     send_message(bot, message)
                 except Exception:
                     pass
-                last_error = str(error)
+                last_error_hash = error_hash
             logger.error(message)
-        finally:
-            time.sleep(RETRY_PERIOD)
+            error_streak += 1
+        retry_period = get_retry_period(error_streak)
+        time.sleep(retry_period)
 
 
 if __name__ == '__main__':
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(),
-            logging.FileHandler('bot.log', encoding='utf-8')
-        ]
-    )
+    configure_logging()
     main()
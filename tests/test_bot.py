@@ -1,6 +1,9 @@
+import atexit
 import inspect
 import logging
+import logging.handlers
 import platform
+import random
 import re
 import time
 from http import HTTPStatus
@@ -52,6 +55,11 @@ class TestHomework:
         'check_response': 1,
         'parse_status': 1,
         'check_tokens': 0,
+        'configure_logging': 0,
+        'join_messages': 1,
+        'parse_statuses': 1,
+        'send_messages': 2,
+        'get_retry_period': 1,
         'main': 0
     }
     RETRY_PERIOD = 600
@@ -461,6 +469,32 @@ class TestHomework:
             else:
                 raise AssertionError(assert_message)
 
+    @pytest.mark.parametrize('homework, expected_error', (
+        ('hw123', TypeError),
+        (['hw123', 'approved'], TypeError),
+        ({'homework_name': 'hw123'}, KeyError),
+        ({'status': 'approved'}, KeyError),
+    ))
+    def test_check_response_invalid_homework(
+            self, homework, expected_error, random_timestamp, homework_module
+    ):
+        func_name = 'check_response'
+        check_utils.check_function(
+            homework_module,
+            func_name,
+            self.HOMEWORK_FUNC_WITH_PARAMS_QTY[func_name]
+        )
+
+        with pytest.raises(expected_error):
+            homework_module.check_response({
+                'homeworks': [homework],
+                'current_date': random_timestamp
+            })
+        homework_module.check_response({
+            'homeworks': [{'lesson_name': 'hw123', 'status': 'approved'}],
+            'current_date': random_timestamp
+        })
+
     def test_send_message(
             self, monkeypatch, random_message, caplog, homework_module
     ):
@@ -495,6 +529,31 @@ class TestHomework:
                 'метод бота `send_message`.'
             )
 
+    def test_send_message_timeout(
+            self, monkeypatch, random_message, homework_module
+    ):
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', '12345')
+
+        func_name = 'send_message'
+        check_utils.check_function(
+            homework_module,
+            func_name,
+            self.HOMEWORK_FUNC_WITH_PARAMS_QTY[func_name]
+        )
+
+        class MockedBotWithTimeout(check_utils.MockTelegramBot):
+            def send_message(self, *args, **kwargs):
+                self.kwargs = kwargs
+                raise requests.exceptions.ReadTimeout('Read timed out.')
+
+        bot = MockedBotWithTimeout()
+        with pytest.raises(ConnectionError):
+            homework_module.send_message(bot, random_message)
+        assert bot.kwargs.get('timeout') == homework_module.TELEGRAM_TIMEOUT, (
+            f'Убедитесь, что функция `{func_name}` передаёт в Telegram '
+            'таймаут `TELEGRAM_TIMEOUT`.'
+        )
+
     def test_bot_initialized_in_main(self, homework_module):
         func_name = 'main'
         check_utils.check_function(
@@ -822,6 +881,446 @@ class TestHomework:
                     'возникновении ошибки отправки сообщения в Телеграм.'
                 ) from e
 
+    def test_join_messages_fit_in_one_chunk(self, homework_module):
+        func_name = 'join_messages'
+        check_utils.check_function(
+            homework_module,
+            func_name,
+            self.HOMEWORK_FUNC_WITH_PARAMS_QTY[func_name]
+        )
+        separator = homework_module.MESSAGE_SEPARATOR
+
+        messages = ['first', 'second', 'third']
+        assert homework_module.join_messages(messages) == [
+            separator.join(messages)
+        ], (
+            f'Убедитесь, что функция `{func_name}` объединяет в одно '
+            'сообщение статусы, которые помещаются в лимит Telegram.'
+        )
+
+    def test_join_messages_split_at_limit(self, homework_module):
+        func_name = 'join_messages'
+        check_utils.check_function(
+            homework_module,
+            func_name,
+            self.HOMEWORK_FUNC_WITH_PARAMS_QTY[func_name]
+        )
+        max_length = homework_module.MESSAGE_MAX_LENGTH
+        separator = homework_module.MESSAGE_SEPARATOR
+
+        half = (max_length - len(separator)) // 2
+        messages = ['a' * half, 'b' * half, 'c', 'd']
+        chunks = homework_module.join_messages(messages)
+        assert chunks == [
+            messages[0] + separator + messages[1],
+            messages[2] + separator + messages[3]
+        ], (
+            f'Убедитесь, что функция `{func_name}` начинает новое '
+            'сообщение, только когда следующий статус не помещается '
+            'в `MESSAGE_MAX_LENGTH`.'
+        )
+        assert len(chunks[0]) == max_length
+        assert all(len(chunk) <= max_length for chunk in chunks), (
+            f'Убедитесь, что функция `{func_name}` не возвращает '
+            'сообщения длиннее `MESSAGE_MAX_LENGTH`.'
+        )
+
+    def test_join_messages_split_oversize_message(self, homework_module):
+        func_name = 'join_messages'
+        check_utils.check_function(
+            homework_module,
+            func_name,
+            self.HOMEWORK_FUNC_WITH_PARAMS_QTY[func_name]
+        )
+        max_length = homework_module.MESSAGE_MAX_LENGTH
+        separator = homework_module.MESSAGE_SEPARATOR
+
+        long_message = 'x' * (max_length + 904)
+        chunks = homework_module.join_messages([long_message, 'tail'])
+        assert all(len(chunk) <= max_length for chunk in chunks), (
+            f'Убедитесь, что функция `{func_name}` разбивает сообщение '
+            'длиннее `MESSAGE_MAX_LENGTH` на части.'
+        )
+        assert chunks == [
+            long_message[:max_length],
+            long_message[max_length:] + separator + 'tail'
+        ], (
+            f'Убедитесь, что функция `{func_name}` не теряет текст '
+            'при разбиении длинного сообщения.'
+        )
+
+    def test_join_messages_empty(self, homework_module):
+        func_name = 'join_messages'
+        check_utils.check_function(
+            homework_module,
+            func_name,
+            self.HOMEWORK_FUNC_WITH_PARAMS_QTY[func_name]
+        )
+
+        assert homework_module.join_messages([]) == [], (
+            f'Убедитесь, что функция `{func_name}` возвращает пустой '
+            'список, если сообщений нет.'
+        )
+
+    def test_parse_statuses_skips_invalid_homework(self, homework_module):
+        func_name = 'parse_statuses'
+        check_utils.check_function(
+            homework_module,
+            func_name,
+            self.HOMEWORK_FUNC_WITH_PARAMS_QTY[func_name]
+        )
+
+        homeworks = [
+            {'homework_name': 'hw_valid', 'status': 'approved'},
+            {'homework_name': 'hw_invalid', 'status': 'unknown'},
+            {'homework_name': 'hw_rejected', 'status': 'rejected'}
+        ]
+        messages = homework_module.parse_statuses(homeworks)
+        assert len(messages) == len(homeworks), (
+            f'Убедитесь, что функция `{func_name}` возвращает сообщение '
+            'для каждой домашки, в том числе некорректной.'
+        )
+        assert 'hw_valid' in messages[0]
+        assert self.HOMEWORK_VERDICTS['approved'] in messages[0]
+        assert 'unknown' in messages[1], (
+            f'Убедитесь, что функция `{func_name}` сообщает об ошибке '
+            'разбора некорректной домашки, не прерывая обработку остальных.'
+        )
+        assert self.HOMEWORK_VERDICTS['rejected'] in messages[2]
+        assert homework_module.parse_statuses([]) == []
+
+    def test_send_messages_keeps_undelivered(
+            self, monkeypatch, homework_module
+    ):
+        func_name = 'send_messages'
+        check_utils.check_function(
+            homework_module,
+            func_name,
+            self.HOMEWORK_FUNC_WITH_PARAMS_QTY[func_name]
+        )
+        sent = []
+
+        def mock_send_message(bot, message):
+            if message == 'second':
+                raise ConnectionError('Telegram is down')
+            sent.append(message)
+
+        monkeypatch.setattr(homework_module, 'send_message', mock_send_message)
+
+        messages = ['first', 'second', 'third']
+        with pytest.raises(ConnectionError):
+            homework_module.send_messages(None, messages)
+        assert sent == ['first']
+        assert messages == ['second', 'third'], (
+            f'Убедитесь, что функция `{func_name}` оставляет в списке '
+            'только недоставленные сообщения.'
+        )
+
+        homework_module.send_messages(None, [])
+        assert sent == ['first'], (
+            f'Убедитесь, что функция `{func_name}` ничего не отправляет, '
+            'если сообщений нет.'
+        )
+
+    def test_main_sends_valid_statuses_from_mixed_batch(
+            self, monkeypatch, random_timestamp, current_timestamp,
+            random_message, homework_module
+    ):
+        self.mock_main(
+            monkeypatch,
+            random_message,
+            random_timestamp,
+            current_timestamp,
+            homework_module
+        )
+        api_results = iter((
+            {
+                'homeworks': [
+                    {'homework_name': 'hw_valid', 'status': 'approved'},
+                    {'homework_name': 'hw_invalid', 'status': 'unknown'}
+                ],
+                'current_date': random_timestamp
+            },
+            {'homeworks': [], 'current_date': random_timestamp + 1},
+        ))
+        requested_timestamps = []
+
+        def mock_get_api_answer(timestamp):
+            requested_timestamps.append(timestamp)
+            return next(api_results)
+
+        sent = []
+        fail_next_send = [True]
+
+        def mock_send_message(bot, message):
+            if fail_next_send[0]:
+                fail_next_send[0] = False
+                raise ConnectionError('Telegram is down')
+            sent.append(message)
+
+        sleeps = []
+
+        def record_sleep(secs):
+            sleeps.append(secs)
+            if len(sleeps) == 2:
+                raise check_utils.BreakInfiniteLoop('break')
+
+        monkeypatch.setattr(
+            homework_module, 'get_api_answer', mock_get_api_answer
+        )
+        monkeypatch.setattr(homework_module, 'send_message', mock_send_message)
+        monkeypatch.setattr(time, 'sleep', record_sleep)
+        try:
+            homework_module.main()
+        except check_utils.BreakInfiniteLoop:
+            pass
+
+        assert requested_timestamps[1] == random_timestamp, (
+            'Убедитесь, что `timestamp` обновляется, даже если часть '
+            'домашек в ответе API некорректна или отправка не удалась.'
+        )
+        status_messages = [
+            message for message in sent
+            if self.HOMEWORK_VERDICTS['approved'] in message
+        ]
+        assert len(status_messages) == 1, (
+            'Убедитесь, что недоставленные статусы отправляются повторно '
+            'ровно один раз.'
+        )
+        assert 'unknown' in status_messages[0]
+
+    def test_check_response_checks_every_homework(
+            self, random_timestamp, homework_module
+    ):
+        func_name = 'check_response'
+        check_utils.check_function(
+            homework_module,
+            func_name,
+            self.HOMEWORK_FUNC_WITH_PARAMS_QTY[func_name]
+        )
+        valid_homework = {'homework_name': 'hw123', 'status': 'approved'}
+
+        with pytest.raises(TypeError):
+            homework_module.check_response({
+                'homeworks': [valid_homework, 'hw456'],
+                'current_date': random_timestamp
+            })
+        with pytest.raises(KeyError):
+            homework_module.check_response({
+                'homeworks': [valid_homework, {'status': 'approved'}],
+                'current_date': random_timestamp
+            })
+
+    def test_retry_period_without_errors(self, homework_module):
+        func_name = 'get_retry_period'
+        check_utils.check_function(
+            homework_module,
+            func_name,
+            self.HOMEWORK_FUNC_WITH_PARAMS_QTY[func_name]
+        )
+
+        for error_streak in (0, 1):
+            assert homework_module.get_retry_period(error_streak) == (
+                self.RETRY_PERIOD
+            ), (
+                f'Убедитесь, что функция `{func_name}` возвращает '
+                '`RETRY_PERIOD`, пока ошибки не повторяются подряд '
+                f'(серия ошибок: {error_streak}).'
+            )
+
+    def test_retry_period_backoff(self, monkeypatch, homework_module):
+        func_name = 'get_retry_period'
+        check_utils.check_function(
+            homework_module,
+            func_name,
+            self.HOMEWORK_FUNC_WITH_PARAMS_QTY[func_name]
+        )
+        factor = homework_module.BACKOFF_FACTOR
+        max_period = homework_module.MAX_RETRY_PERIOD
+
+        monkeypatch.setattr(random, 'uniform', lambda low, high: 1)
+        for error_streak in (2, 3, 4):
+            expected = self.RETRY_PERIOD * factor ** (error_streak - 1)
+            assert homework_module.get_retry_period(error_streak) == (
+                pytest.approx(expected)
+            ), (
+                f'Убедитесь, что функция `{func_name}` увеличивает паузу '
+                'в `BACKOFF_FACTOR` раз с каждой новой ошибкой подряд.'
+            )
+        assert homework_module.get_retry_period(100) == max_period, (
+            f'Убедитесь, что функция `{func_name}` ограничивает паузу '
+            'значением `MAX_RETRY_PERIOD`.'
+        )
+
+    @pytest.mark.parametrize('jitter_bound', (min, max))
+    def test_retry_period_jitter_bounds(
+            self, monkeypatch, jitter_bound, homework_module
+    ):
+        jitter = homework_module.BACKOFF_JITTER
+        max_period = homework_module.MAX_RETRY_PERIOD
+
+        monkeypatch.setattr(random, 'uniform', jitter_bound)
+        for error_streak in (2, 100):
+            period = homework_module.get_retry_period(error_streak)
+            assert period <= max_period * (1 + jitter), (
+                'Убедитесь, что пауза с учётом разброса не превышает '
+                '`MAX_RETRY_PERIOD * (1 + BACKOFF_JITTER)`.'
+            )
+            assert period >= self.RETRY_PERIOD * (1 - jitter), (
+                'Убедитесь, что пауза с учётом разброса не меньше '
+                '`RETRY_PERIOD * (1 - BACKOFF_JITTER)`.'
+            )
+
+    def test_main_resets_error_streak_after_success(
+            self, monkeypatch, random_timestamp, current_timestamp,
+            random_message, homework_module
+    ):
+        self.mock_main(
+            monkeypatch,
+            random_message,
+            random_timestamp,
+            current_timestamp,
+            homework_module
+        )
+        factor = homework_module.BACKOFF_FACTOR
+        monkeypatch.setattr(random, 'uniform', lambda low, high: 1)
+
+        api_results = iter((
+            ConnectionError('first'),
+            ConnectionError('second'),
+            {'homeworks': [], 'current_date': random_timestamp},
+            ConnectionError('third'),
+        ))
+
+        def mock_get_api_answer(timestamp):
+            result = next(api_results)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        sleeps = []
+
+        def record_sleep(secs):
+            sleeps.append(secs)
+            if len(sleeps) == 4:
+                raise check_utils.BreakInfiniteLoop('break')
+
+        monkeypatch.setattr(
+            homework_module, 'get_api_answer', mock_get_api_answer
+        )
+        monkeypatch.setattr(time, 'sleep', record_sleep)
+        try:
+            homework_module.main()
+        except check_utils.BreakInfiniteLoop:
+            pass
+        assert sleeps == pytest.approx([
+            self.RETRY_PERIOD,
+            self.RETRY_PERIOD * factor,
+            self.RETRY_PERIOD,
+            self.RETRY_PERIOD,
+        ]), (
+            'Убедитесь, что после успешного запроса к API серия ошибок '
+            'сбрасывается и пауза возвращается к `RETRY_PERIOD`.'
+        )
+
+    def test_main_sends_repeated_error_once(
+            self, monkeypatch, random_timestamp, current_timestamp,
+            random_message, homework_module
+    ):
+        self.mock_main(
+            monkeypatch,
+            random_message,
+            random_timestamp,
+            current_timestamp,
+            homework_module
+        )
+        errors = iter((
+            ConnectionError('API is down'),
+            ConnectionError('API is down'),
+            ValueError('Bad JSON'),
+        ))
+
+        def mock_get_api_answer(timestamp):
+            raise next(errors)
+
+        sent = []
+        sleeps = []
+
+        def record_sleep(secs):
+            sleeps.append(secs)
+            if len(sleeps) == 3:
+                raise check_utils.BreakInfiniteLoop('break')
+
+        monkeypatch.setattr(
+            homework_module, 'get_api_answer', mock_get_api_answer
+        )
+        monkeypatch.setattr(
+            homework_module,
+            'send_message',
+            lambda bot, message: sent.append(message)
+        )
+        monkeypatch.setattr(time, 'sleep', record_sleep)
+        try:
+            homework_module.main()
+        except check_utils.BreakInfiniteLoop:
+            pass
+
+        assert len(sent) == 2, (
+            'Убедитесь, что повторяющаяся ошибка отправляется в Telegram '
+            'только один раз, а новая ошибка — отправляется.'
+        )
+        assert 'API is down' in sent[0]
+        assert 'Bad JSON' in sent[1]
+
+    def test_configure_logging_is_idempotent(
+            self, monkeypatch, tmp_path, homework_module
+    ):
+        monkeypatch.chdir(tmp_path)
+        listeners = []
+        monkeypatch.setattr(
+            atexit, 'register', lambda stop: listeners.append(stop)
+        )
+        root_logger = logging.getLogger()
+        saved_handlers = root_logger.handlers[:]
+        saved_level = root_logger.level
+        root_logger.handlers = []
+        try:
+            homework_module.configure_logging()
+            homework_module.configure_logging()
+            queue_handlers = [
+                handler for handler in root_logger.handlers
+                if isinstance(handler, logging.handlers.QueueHandler)
+            ]
+            assert len(queue_handlers) == 1, (
+                'Убедитесь, что повторный вызов `configure_logging()` не '
+                'добавляет корневому логгеру второй `QueueHandler`.'
+            )
+            assert len(listeners) == 1, (
+                'Убедитесь, что повторный вызов `configure_logging()` не '
+                'запускает второй `QueueListener`.'
+            )
+            logging.getLogger('homework').info('Запись в файл')
+        finally:
+            for stop_listener in listeners:
+                stop_listener()
+            for handler in root_logger.handlers:
+                handler.close()
+            root_logger.handlers = saved_handlers
+            root_logger.setLevel(saved_level)
+
+        log_lines = (tmp_path / 'bot.log').read_text(
+            encoding='utf-8'
+        ).splitlines()
+        assert len(log_lines) == 1
+        assert re.fullmatch(
+            r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3} - homework - '
+            r'INFO - Запись в файл',
+            log_lines[0]
+        ), (
+            'Убедитесь, что записи доходят до `bot.log` в формате '
+            '`время - логгер - уровень - сообщение`.'
+        )
+
     def test_docstrings(self, homework_module):
         for func in self.HOMEWORK_FUNC_WITH_PARAMS_QTY:
             check_utils.check_docstring(homework_module, func)